@@ -0,0 +1,222 @@
+"""
+Alternative render backend that avoids PIL's PixelAccess objects in the inner loops.
+
+The framebuffer, depth buffer and textures are flat array.array/bytearray buffers
+that are indexed with plain integer math, and the framebuffer is converted
+to the PIL image only once per frame. This is written with PyPy in mind:
+its JIT compiles these simple loops into tight machine code, whereas every
+PixelAccess call (and every color tuple) has to go through the slow C-API bridge.
+"""
+
+from array import array
+from typing import Dict, Optional, Tuple, List
+from PIL import Image
+from .mapstuff import Map, Texture, ColumnCache
+from .raycaster import Raycaster
+
+
+class ArrayRaycaster(Raycaster):
+    """
+    Drop-in replacement for the Raycaster that renders into a flat RGB bytearray framebuffer,
+    with a flat array of doubles as its depth buffer (instead of the Raycaster's zbuffer list).
+    Textures are read from their flat Texture.pixels bytes, so the textures can be shared with other Raycasters.
+
+    Instead of the Raycaster's column_cache of color tuples, two caches are kept that don't depend on the texture:
+    texel_rows holds the texture offsets of the texel rows of a wall column of a certain height,
+    and shading_tables holds the color values of all 256 color intensities at a certain brightness.
+
+    The buffers can hold several frames stacked on top of each other (see MultiViewRaycaster);
+    frame_offset is the pixel offset of the frame that is currently being drawn.
+    """
+
+    def __init__(self, pixwidth: int, pixheight: int, dungeon_map: Map,
+                 textures: Optional[Dict[str, Texture]] = None, num_frames: int = 1) -> None:
+        self.num_frames = num_frames
+        self.frame_offset = 0
+        super().__init__(pixwidth, pixheight, dungeon_map, textures)
+        self.plane_scales = [(x / pixwidth - 0.5) * 2 for x in range(pixwidth)]
+
+    def init_buffers(self) -> None:
+        num_pixels = self.pixwidth * self.pixheight * self.num_frames
+        self.empty_depthbuffer = array('d', [float("inf")]) * num_pixels
+        self.depthbuffer = array('d', self.empty_depthbuffer)
+        self.framebuffer = bytearray(num_pixels * 3)
+        self.image = Image.new("RGB", (self.pixwidth, self.pixheight * self.num_frames), color=0)
+        self.texel_rows = ColumnCache(self.wall_texel_rows)
+        self.shading_tables = ColumnCache(self.shading_table, maxsize=1024)
+
+    def clear_buffers(self) -> None:
+        self.depthbuffer[:] = self.empty_depthbuffer
+
+    def tick(self, walltime_msec: float) -> None:
+        super().tick(walltime_msec)
+        self.image.frombytes(self.framebuffer)
+
+    def wall_texel_rows(self, wall_height: int) -> List[int]:
+        """The offsets in a texture of the texel rows of the visible part of a wall column with the given height."""
+        ceiling = (self.pixheight - wall_height) // 2
+        start_y = max(0, ceiling)
+        size = Texture.SIZE
+        mask = Texture.SIZE_MASK
+        return [(int((y - ceiling) / wall_height * size) & mask) * size * 4
+                for y in range(start_y, self.pixheight - start_y)]
+
+    def shading_table(self, brightness: float) -> bytes:
+        """Every color intensity 0..255 adjusted to the given brightness."""
+        return bytes([int(c * brightness) for c in range(256)])
+
+    def cast_ray_dda(self, pixel_x: int) -> Tuple[int, float, float]:
+        # the same algorithm as Raycaster.cast_ray_dda, but without the Vec2 objects
+        pos_x, pos_y = self.player_position.x, self.player_position.y
+        camera_x = 2.0 * pixel_x / self.pixwidth - 1.0
+        ray_x = self.player_direction.x + self.camera_plane.x * camera_x
+        ray_y = self.player_direction.y + self.camera_plane.y * camera_x
+        map_x = int(pos_x)
+        map_y = int(pos_y)
+        delta_dist_x = abs(1 / ray_x) if ray_x else float("inf")
+        delta_dist_y = abs(1 / ray_y) if ray_y else float("inf")
+        if ray_x < 0:
+            step_x = -1
+            side_dist_x = (pos_x - map_x) * delta_dist_x
+        else:
+            step_x = 1
+            side_dist_x = (map_x + 1.0 - pos_x) * delta_dist_x
+        if ray_y < 0:
+            step_y = -1
+            side_dist_y = (pos_y - map_y) * delta_dist_y
+        else:
+            step_y = 1
+            side_dist_y = (map_y + 1.0 - pos_y) * delta_dist_y
+        map_rows = self.map.map
+        side = False
+        wall = 0
+        while wall == 0:
+            if side_dist_x < side_dist_y:
+                side_dist_x += delta_dist_x
+                map_x += step_x
+                side = False
+            else:
+                side_dist_y += delta_dist_y
+                map_y += step_y
+                side = True
+            wall = map_rows[map_y][map_x]
+        if side:
+            distance = (map_y - pos_y + (1 - step_y) / 2) / ray_y
+        else:
+            distance = (map_x - pos_x + (1 - step_x) / 2) / ray_x
+        if 0 < distance < self.BLACK_DISTANCE:
+            if side:
+                return wall, distance, pos_x + distance * ray_x
+            return wall, distance, pos_y + distance * ray_y
+        return -1, self.BLACK_DISTANCE, 0.0
+
+    def draw_column(self, x: int, ceiling: int, distance: float, texture: Texture, tx: float) -> None:
+        brightness = self.brightness(distance)
+        pixels = texture.pixels
+        tex_offset = (int(tx * texture.SIZE) & texture.SIZE_MASK) * 4
+        framebuffer = self.framebuffer
+        depthbuffer = self.depthbuffer
+        width = self.pixwidth
+        offset = x + max(0, ceiling) * width + self.frame_offset
+        # walls are drawn first, on a cleared depth buffer, so every pixel of the column is visible
+        for tex_row in self.texel_rows.get(self.pixheight - 2 * ceiling):
+            t = tex_row + tex_offset
+            depthbuffer[offset] = distance
+            f = offset * 3
+            framebuffer[f] = int(pixels[t] * brightness)
+            framebuffer[f+1] = int(pixels[t+1] * brightness)
+            framebuffer[f+2] = int(pixels[t+2] * brightness)
+            offset += width
+
+    def draw_black_column(self, x: int, ceiling: int, distance: float) -> None:
+        start_y = max(0, ceiling)
+        framebuffer = self.framebuffer
+        depthbuffer = self.depthbuffer
+        width = self.pixwidth
+        frame_offset = self.frame_offset
+        for y in range(start_y, self.pixheight - start_y):
+            offset = x + y * width + frame_offset
+            if distance < depthbuffer[offset]:
+                depthbuffer[offset] = distance
+                offset *= 3
+                framebuffer[offset] = framebuffer[offset+1] = framebuffer[offset+2] = 0
+
+    def draw_floor_and_ceiling(self, ceiling_sizes: List[int], d_screen: float) -> None:
+        mcs = max(ceiling_sizes)
+        if mcs <= 0:
+            return
+        max_height_possible = int(self.pixheight * (1.0 - d_screen / self.BLACK_DISTANCE) / 2.0)
+        ceiling_pixels = self.textures["ceiling"].pixels
+        floor_pixels = self.textures["floor"].pixels
+        mask = Texture.SIZE_MASK
+        size = Texture.SIZE
+        framebuffer = self.framebuffer
+        depthbuffer = self.depthbuffer
+        width = self.pixwidth
+        frame_offset = self.frame_offset
+        plane_scales = self.plane_scales
+        pos_x, pos_y = self.player_position.x, self.player_position.y
+        dir_x, dir_y = self.player_direction.x, self.player_direction.y
+        plane_x, plane_y = self.camera_plane.x, self.camera_plane.y
+        for y in range(min(mcs, max_height_possible)):
+            sy = 0.5 - y / self.pixheight
+            d_ground = 0.5 * d_screen / sy    # how far, horizontally over the ground, is this away from us?
+            shade = self.shading_tables.get(self.brightness(d_ground))
+            row_offset = y * width + frame_offset
+            mirror_row_offset = (self.pixheight - y - 1) * width + frame_offset
+            for x, h in enumerate(ceiling_sizes):
+                if y < h and d_ground < depthbuffer[x + row_offset]:
+                    plane_scale = plane_scales[x]
+                    ray_x = pos_x + d_ground * (dir_x + plane_x * plane_scale)
+                    ray_y = pos_y + d_ground * (dir_y + plane_y * plane_scale)
+                    t = ((int(ray_y * size) & mask) * size + (int(ray_x * size) & mask)) * 4
+                    # we use the fact that the ceiling and floor are mirrored
+                    offset = x + row_offset
+                    depthbuffer[offset] = d_ground
+                    offset *= 3
+                    framebuffer[offset] = shade[ceiling_pixels[t]]
+                    framebuffer[offset+1] = shade[ceiling_pixels[t+1]]
+                    framebuffer[offset+2] = shade[ceiling_pixels[t+2]]
+                    offset = x + mirror_row_offset
+                    if d_ground < depthbuffer[offset]:
+                        depthbuffer[offset] = d_ground
+                        offset *= 3
+                        framebuffer[offset] = shade[floor_pixels[t]]
+                        framebuffer[offset+1] = shade[floor_pixels[t+1]]
+                        framebuffer[offset+2] = shade[floor_pixels[t+2]]
+
+    def draw_sprite(self, texture: Texture, x_start: int, x_end: int, x_start_original: float,
+                    pixel_width: int, pixel_height: int, y_offset: int, tex_y_offset: int,
+                    distance: float, brightness: float) -> None:
+        size = texture.SIZE
+        mask = texture.SIZE_MASK
+        pixels = texture.pixels
+        framebuffer = self.framebuffer
+        depthbuffer = self.depthbuffer
+        width = self.pixwidth
+        frame_offset = self.frame_offset
+        for y in range(min(pixel_height, self.pixheight - y_offset)):
+            tex_row = (int((y + tex_y_offset) / pixel_height * size) & mask) * size
+            row_offset = (y + y_offset) * width + frame_offset
+            for x in range(x_start, x_end):
+                t = (tex_row + (int(((x - x_start_original) / pixel_width - 1.0) * size) & mask)) * 4
+                if pixels[t+3] > 200:   # consider alpha channel
+                    offset = x + row_offset
+                    if distance < depthbuffer[offset]:
+                        depthbuffer[offset] = distance
+                        offset *= 3
+                        framebuffer[offset] = int(pixels[t] * brightness)
+                        framebuffer[offset+1] = int(pixels[t+1] * brightness)
+                        framebuffer[offset+2] = int(pixels[t+2] * brightness)
+
+    def set_pixel(self, x: int, y: int, z: float, brightness: float,
+                  rgba: Optional[Tuple[int, int, int, int]]) -> None:
+        offset = x + y * self.pixwidth + self.frame_offset
+        if rgba and z < self.depthbuffer[offset]:
+            self.depthbuffer[offset] = z
+            if z <= 0:
+                brightness = 1.0
+            offset *= 3
+            self.framebuffer[offset] = int(rgba[0] * brightness)
+            self.framebuffer[offset+1] = int(rgba[1] * brightness)
+            self.framebuffer[offset+2] = int(rgba[2] * brightness)
@@ -0,0 +1,90 @@
+"""
+Compare the render speed of the PIL PixelAccess based Raycaster with the array based one.
+Run this with both CPython and PyPy:  python -m pyraycaster.benchmark [frames]
+"""
+
+import sys
+import time
+import platform
+from typing import Type, List
+from .mapstuff import Map
+from .raycaster import Raycaster, Camera, load_textures
+from .arraybackend import ArrayRaycaster
+from .multiview import MultiViewRaycaster
+from .vector import Vec2
+
+
+BENCHMARK_MAP = ["11111111111111111111",
+                 "1..................1",
+                 "1..111111222222.2221",
+                 "1.....1.....2.....t1",
+                 "1.g...1.gh..2..h...1",
+                 "1...111t....2222...1",
+                 "1....t1222..2......1",
+                 "1....g.222..2.1.2.11",
+                 "1.h.......s........1",
+                 "11111111111111111111"]
+BENCHMARK_VIEW_POSITIONS = [Vec2(10.5, 1.5), Vec2(1.5, 1.5), Vec2(17.5, 1.5), Vec2(5.5, 8.5)]
+
+
+def benchmark(raycaster_class: Type[Raycaster], frames: int) -> float:
+    raycaster = raycaster_class(200, 120, Map(BENCHMARK_MAP))
+    # warm up (this gives PyPy's JIT the chance to compile the render loops)
+    for _ in range(10):
+        raycaster.tick(0)
+    start = time.perf_counter()
+    for frame in range(frames):
+        raycaster.rotate_player(0.05)
+        raycaster.move_player_forward_or_back(0.05 if (frame // 50) % 2 else -0.05)
+        raycaster.tick(0)
+    return frames / (time.perf_counter() - start)
+
+
+def benchmark_cameras(frame: int) -> List[Camera]:
+    return [Camera(position, 0.05 * frame + view) for view, position in enumerate(BENCHMARK_VIEW_POSITIONS)]
+
+
+def benchmark_separate_views(raycaster_class: Type[Raycaster], frames: int) -> float:
+    """Renders the benchmark views with one Raycaster per view. Returns the total frames per second."""
+    dungeon_map = Map(BENCHMARK_MAP)
+    textures = load_textures()
+    raycasters = [raycaster_class(200, 120, dungeon_map, textures) for _ in BENCHMARK_VIEW_POSITIONS]
+    start = time.perf_counter()
+    for frame in range(-10, frames):
+        if frame == 0:
+            start = time.perf_counter()
+        for raycaster, camera in zip(raycasters, benchmark_cameras(frame)):
+            raycaster.set_camera(camera)
+            raycaster.tick(0)
+    return frames * len(raycasters) / (time.perf_counter() - start)
+
+
+def benchmark_multiview(frames: int) -> float:
+    """Renders the benchmark views with a single MultiViewRaycaster. Returns the total frames per second."""
+    raycaster = MultiViewRaycaster(200, 120, Map(BENCHMARK_MAP))
+    start = time.perf_counter()
+    for frame in range(-10, frames):
+        if frame == 0:
+            start = time.perf_counter()
+        raycaster.render(benchmark_cameras(frame))
+    return frames * len(BENCHMARK_VIEW_POSITIONS) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{platform.python_implementation()} {platform.python_version()}, {frames} frames of 200x120")
+    for raycaster_class in (Raycaster, ArrayRaycaster):
+        fps = benchmark(raycaster_class, frames)
+        print(f"  {raycaster_class.__name__:20s} {fps:6.1f} fps")
+    num_views = len(BENCHMARK_VIEW_POSITIONS)
+    print(f"{num_views} views, {frames // num_views} frames each, total frames per second:")
+    for raycaster_class in (Raycaster, ArrayRaycaster):
+        fps = benchmark_separate_views(raycaster_class, frames // num_views)
+        label = f"{num_views} x {raycaster_class.__name__}"
+        print(f"  {label:20s} {fps:6.1f} fps")
+    fps = benchmark_multiview(frames // num_views)
+    print(f"  {'MultiViewRaycaster':20s} {fps:6.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
+import argparse
 import tkinter
 import time
 import math
 from PIL import Image, ImageTk
 from .raycaster import Raycaster, Map
+from .arraybackend import ArrayRaycaster
 
 
 # TODO port this to PyGame instead of using tkinter. That should result in a significant performance boost?
@@ -66,7 +68,7 @@ class RaycasterWindow(tkinter.Tk):
     PIXEL_WIDTH = 200
     PIXEL_HEIGHT = 120
 
-    def __init__(self):
+    def __init__(self, raycaster_class=Raycaster):
         super().__init__()
         self.perf_timestamp = time.monotonic()
         self.time_msec_epoch = int(time.monotonic() * 1000)
@@ -80,7 +82,7 @@ class RaycasterWindow(tkinter.Tk):
                            "1....g.222..2.1.2.11",
                            "1.h.......s........1",
                            "11111111111111111111"])
-        self.raycaster = Raycaster(self.PIXEL_WIDTH, self.PIXEL_HEIGHT, dungeon_map)
+        self.raycaster = raycaster_class(self.PIXEL_WIDTH, self.PIXEL_HEIGHT, dungeon_map)
         self.imageTk = None
         self.resizable(0, 0)
         self.configure(borderwidth=self.PIXEL_SCALE, background="black")
@@ -176,5 +178,9 @@ class RaycasterWindow(tkinter.Tk):
 
 
 def main():
-    w = RaycasterWindow()
+    parser = argparse.ArgumentParser(description="pure Python raycaster")
+    parser.add_argument("--array", action="store_true",
+                        help="use the array based render backend (fastest on Pypy)")
+    args = parser.parse_args()
+    w = RaycasterWindow(ArrayRaycaster if args.array else Raycaster)
     w.mainloop()
@@ -1,7 +1,8 @@
 import io
 import pkgutil
+from collections import OrderedDict
 from PIL import Image
-from typing import Union, List, Dict, Tuple, BinaryIO
+from typing import Union, List, Dict, Tuple, BinaryIO, Any, Callable, Sequence, Hashable
 
 
 class Texture:
@@ -19,6 +20,7 @@ class Texture:
                 raise IOError(f"texture is not {self.SIZE}x{self.SIZE}")
             img = img.convert('RGBA')
             self.image = img.load()
+            self.pixels = img.tobytes()     # flat RGBA bytes, row by row, for the array render backend
 
     def sample(self, x: float, y: float) -> Tuple[int, int, int, int]:
         """Sample a texture color at the given coordinates, normalized 0.0 ... 0.999999999, wrapping around"""
@@ -26,6 +28,57 @@ class Texture:
         yi = int(y*self.SIZE)
         return self.image[xi & self.SIZE_MASK, yi & self.SIZE_MASK]
 
+    def scaled_column(self, column: int, wall_height: int, screen_height: int) -> List[Tuple[int, int, int, int]]:
+        """The texels of a texture column stretched to the projected wall height on the screen.
+        Only the visible part is returned: walls taller than the screen are clipped at the top and bottom."""
+        ceiling = (screen_height - wall_height) // 2
+        start_y = max(0, ceiling)
+        size = self.SIZE
+        mask = self.SIZE_MASK
+        image = self.image      # type: Any
+        return [image[column, int((y - ceiling) / wall_height * size) & mask]
+                for y in range(start_y, screen_height - start_y)]
+
+
+class ColumnCache:
+    """
+    Bounded LRU cache of pre-scaled columns (strips) that are expensive to compute, such as wall texture columns.
+    The texels of a wall column on the screen only depend on the texture,
+    the texture column and the projected wall height, so many screen columns can share them.
+    Missing strips are created by calling the strip_factory with the key that was asked for.
+    """
+    def __init__(self, strip_factory: Callable[..., Sequence[Any]], maxsize: int = 2048) -> None:
+        self.strip_factory = strip_factory
+        self.maxsize = maxsize
+        self.columns = OrderedDict()    # type: OrderedDict[Tuple[Hashable, ...], Sequence[Any]]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, *key: Hashable) -> Sequence[Any]:
+        strip = self.columns.get(key)
+        if strip is not None:
+            self.hits += 1
+            self.columns.move_to_end(key)
+            return strip
+        self.misses += 1
+        strip = self.strip_factory(*key)
+        self.columns[key] = strip
+        if len(self.columns) > self.maxsize:
+            self.columns.popitem(last=False)
+        return strip
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        self.columns.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
 
 class Map:
     def __init__(self, mapdef: List[str]) -> None:
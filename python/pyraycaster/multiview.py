@@ -0,0 +1,72 @@
+"""
+Rendering of several camera views of the same map in a single call.
+
+Every stage of the render pipeline is done for all views before moving to the next:
+first the rays of all views are cast, then the walls of all views are drawn,
+then the floors and ceilings, and finally the sprites.
+All views are drawn by one ArrayRaycaster into its framebuffer, with the frames of the views
+stacked on top of each other, and that is converted to an image just once.
+The views share the textures and the renderer's caches (wall texel rows and shading tables),
+but every view still costs about the same as rendering it with its own ArrayRaycaster.
+"""
+
+from typing import Dict, List, Optional, Sequence
+from PIL import Image
+from .mapstuff import Map, Texture
+from .raycaster import Camera, load_textures
+from .arraybackend import ArrayRaycaster
+
+
+class MultiViewRaycaster:
+    """
+    Renders the views of a list of cameras, stacked vertically in a single image (first camera at the top).
+    The raw stacked RGB frames are available in renderer.framebuffer after rendering.
+    """
+
+    def __init__(self, pixwidth: int, pixheight: int, dungeon_map: Map,
+                 textures: Optional[Dict[str, Texture]] = None) -> None:
+        self.pixwidth = pixwidth
+        self.pixheight = pixheight
+        self.map = dungeon_map
+        self.textures = textures or load_textures()
+        self.num_views = 0
+        self.renderer = None        # type: Optional[ArrayRaycaster]
+        self.ceiling_sizes = []     # type: List[List[int]]
+
+    def render(self, cameras: Sequence[Camera]) -> Image.Image:
+        if not cameras:
+            raise ValueError("need at least one camera to render")
+        if self.renderer is None or len(cameras) != self.num_views:
+            self.num_views = len(cameras)
+            self.renderer = ArrayRaycaster(self.pixwidth, self.pixheight, self.map, self.textures, self.num_views)
+            self.ceiling_sizes = [[0] * self.pixwidth for _ in cameras]
+        renderer = self.renderer
+        renderer.frame += 1
+        renderer.clear_buffers()
+        frame_size = self.pixwidth * self.pixheight
+        d_screens = []
+        ray_hits = []
+        for camera in cameras:
+            renderer.set_camera(camera)
+            d_screens.append(renderer.screen_distance())
+            ray_hits.append([renderer.cast_ray_dda(x) for x in range(self.pixwidth)])
+        for view, camera in enumerate(cameras):
+            renderer.set_camera(camera)
+            renderer.frame_offset = view * frame_size
+            renderer.draw_walls(ray_hits[view], d_screens[view], self.ceiling_sizes[view])
+        for view, camera in enumerate(cameras):
+            renderer.set_camera(camera)
+            renderer.frame_offset = view * frame_size
+            renderer.draw_floor_and_ceiling(self.ceiling_sizes[view], d_screens[view])
+        for view, camera in enumerate(cameras):
+            renderer.set_camera(camera)
+            renderer.frame_offset = view * frame_size
+            renderer.draw_sprites(d_screens[view])
+        renderer.image.frombytes(renderer.framebuffer)
+        return renderer.image
+
+    def frame(self, view: int) -> Image.Image:
+        """Returns the frame of a single view from the last rendered stacked image."""
+        if self.renderer is None or not 0 <= view < self.num_views:
+            raise IndexError(f"view {view} out of range, {self.num_views} views were rendered")
+        return self.renderer.image.crop((0, view * self.pixheight, self.pixwidth, (view + 1) * self.pixheight))
@@ -1,8 +1,8 @@
 from math import pi, tan, radians, cos
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict, Any
 from PIL import Image
 from .vector import Vec2
-from .mapstuff import Map, Texture
+from .mapstuff import Map, Texture, ColumnCache
 
 
 # Micro Optimization ideas:
@@ -11,28 +11,49 @@ from .mapstuff import Map, Texture
 #   (but that results in code that is harder to understand)
 
 
+TEXTURE_FILES = {
+    "test": "textures/test.png",
+    "floor": "textures/floor.png",
+    "ceiling": "textures/ceiling.png",
+    "wall-bricks": "textures/wall-bricks.png",
+    "wall-stone": "textures/wall-stone.png",
+    "creature-gargoyle": "textures/gargoyle.png",
+    "creature-hero": "textures/legohero.png",
+    "treasure": "textures/treasure.png",
+}
+
+
+def load_textures() -> Dict[str, Texture]:
+    """Load all textures used by the engine. The result can be shared by multiple Raycasters."""
+    return {name: Texture(filename) for name, filename in TEXTURE_FILES.items()}
+
+
+class Camera:
+    """Position, viewing direction and (horizontal) field of view of a single view into the world."""
+
+    def __init__(self, position: Vec2, angle: float, fov: float = radians(80)) -> None:
+        self.position = position
+        self.fov = fov
+        self.direction = Vec2.from_angle(angle)
+        self.camera_plane = Vec2.from_angle(angle - pi / 2) * tan(fov / 2)
+
+
 class Raycaster:
     HVOF = radians(80)
     BLACK_DISTANCE = 4.5
 
-    def __init__(self, pixwidth: int, pixheight: int, dungeon_map: Map) -> None:
+    def __init__(
+        self,
+        pixwidth: int,
+        pixheight: int,
+        dungeon_map: Map,
+        textures: Optional[Dict[str, Texture]] = None,
+    ) -> None:
         self.pixwidth = pixwidth
         self.pixheight = pixheight
-        self.empty_zbuffer = [float("inf")] * pixheight * pixwidth
-        self.zbuffer = self.empty_zbuffer[:]
         self.ceiling_sizes = [0] * pixwidth
-        self.image = Image.new("RGB", (pixwidth, pixheight), color=0)
-        self.image_buf = self.image.load()
-        self.textures = {
-            "test": Texture("textures/test.png"),
-            "floor": Texture("textures/floor.png"),
-            "ceiling": Texture("textures/ceiling.png"),
-            "wall-bricks": Texture("textures/wall-bricks.png"),
-            "wall-stone": Texture("textures/wall-stone.png"),
-            "creature-gargoyle": Texture("textures/gargoyle.png"),
-            "creature-hero": Texture("textures/legohero.png"),
-            "treasure": Texture("textures/treasure.png"),
-        }
+        self.init_buffers()
+        self.textures = textures or load_textures()
         self.wall_textures = [
             self.textures["test"],
             self.textures["wall-bricks"],
@@ -47,19 +68,55 @@ class Raycaster:
             self.map.player_start[0] + 0.5, self.map.player_start[1] + 0.5
         )
 
+    def init_buffers(self) -> None:
+        """Allocates the image that is drawn into, and the buffers used while drawing it."""
+        self.empty_zbuffer = [float("inf")] * self.pixheight * self.pixwidth
+        self.zbuffer = self.empty_zbuffer[:]
+        self.column_cache = ColumnCache(
+            lambda texture, column, wall_height: texture.scaled_column(
+                column, wall_height, self.pixheight
+            )
+        )
+        self.image = Image.new("RGB", (self.pixwidth, self.pixheight), color=0)
+        self.image_buf = self.image.load()
+
+    def clear_buffers(self) -> None:
+        self.zbuffer[:] = self.empty_zbuffer
+
+    def get_camera(self) -> Camera:
+        return Camera(self.player_position, self.player_direction.angle(), self.HVOF)
+
+    def set_camera(self, camera: Camera) -> None:
+        self.HVOF = camera.fov
+        self.player_position = camera.position
+        self.player_direction = camera.direction
+        self.camera_plane = camera.camera_plane
+
     def tick(self, walltime_msec: float) -> None:
         self.frame += 1
-        self.zbuffer[:] = self.empty_zbuffer  # clear zbuffer
+        self.clear_buffers()
         # cast a ray per pixel column on the screen!
         # (we end up redrawing all pixels of the screen, so no explicit clear is needed)
         # NOTE: multithreading is not useful because of Python's GIL
         #       multiprocessing is probably not useful because of IPC overhead to sync the world state...
         d_screen = self.screen_distance()
-        for x in range(self.pixwidth):
-            wall, distance, texture_x = self.cast_ray_dda(x)
+        ray_hits = [self.cast_ray_dda(x) for x in range(self.pixwidth)]
+        self.draw_walls(ray_hits, d_screen, self.ceiling_sizes)
+        self.draw_floor_and_ceiling(self.ceiling_sizes, d_screen)
+        self.draw_sprites(d_screen)
+
+    def draw_walls(
+        self,
+        ray_hits: List[Tuple[int, float, float]],
+        d_screen: float,
+        ceiling_sizes: List[int],
+    ) -> None:
+        """Draws the wall column for every (wall, distance, texture_x) ray hit.
+        The size of the ceiling above each column is stored in ceiling_sizes."""
+        for x, (wall, distance, texture_x) in enumerate(ray_hits):
             if distance > 0:
                 ceiling_size = int(self.pixheight * (1.0 - d_screen / distance) / 2.0)
-                self.ceiling_sizes[x] = ceiling_size
+                ceiling_sizes[x] = ceiling_size
                 if wall > 0:
                     self.draw_column(
                         x, ceiling_size, distance, self.wall_textures[wall], texture_x
@@ -67,9 +124,7 @@ class Raycaster:
                 else:
                     self.draw_black_column(x, ceiling_size, distance)
             else:
-                self.ceiling_sizes[x] = 0
-        self.draw_floor_and_ceiling(self.ceiling_sizes, d_screen)
-        self.draw_sprites(d_screen)
+                ceiling_sizes[x] = 0
 
     def cast_ray_dda(self, pixel_x: int) -> Tuple[int, float, float]:
         # code adapted from: https://lodev.org/cgtutor/raycasting.html
@@ -154,15 +209,19 @@ class Raycaster:
         start_y = max(0, ceiling)
         num_pixels = self.pixheight - 2 * start_y
         wall_height = self.pixheight - 2 * ceiling
+        strip = self.column_cache.get(
+            texture, int(tx * texture.SIZE) & texture.SIZE_MASK, wall_height
+        )
         brightness = self.brightness(distance)
-        for y in range(start_y, start_y + num_pixels):
-            self.set_pixel(
-                x,
-                y,
-                distance,
-                brightness,
-                texture.sample(tx, (y - ceiling) / wall_height),
-            )
+        if brightness != 1.0:
+            strip = [self.color_brightness(rgba, brightness) for rgba in strip]
+        # walls are drawn first, on a cleared zbuffer, so every pixel of the column is visible
+        start = x + start_y * self.pixwidth
+        stop = x + (start_y + num_pixels) * self.pixwidth
+        self.zbuffer[start:stop:self.pixwidth] = [distance] * num_pixels
+        image_buf = self.image_buf  # type: Any
+        for y, rgba in enumerate(strip, start_y):
+            image_buf[x, y] = rgba
 
     def draw_black_column(self, x: int, ceiling: int, distance: float) -> None:
         start_y = max(0, ceiling)
@@ -289,20 +348,42 @@ class Raycaster:
                 x_end = min(self.pixwidth, int(middle_pixel_column + pixel_width / 2))
                 if x_start >= x_end:
                     continue
-                for y in range(min(pixel_height, self.pixheight - y_offset)):
-                    for x in range(x_start, x_end):
-                        tc = texture.sample(
-                            (x - x_start_original) / pixel_width - 1.0,
-                            (y + tex_y_offset) / pixel_height,
-                        )
-                        if tc[3] > 200:  # consider alpha channel
-                            self.set_pixel(
-                                x,
-                                y + y_offset,
-                                sprite_perpendicular_distance,
-                                brightness,
-                                tc,
-                            )
+                self.draw_sprite(
+                    texture,
+                    x_start,
+                    x_end,
+                    x_start_original,
+                    pixel_width,
+                    pixel_height,
+                    y_offset,
+                    tex_y_offset,
+                    sprite_perpendicular_distance,
+                    brightness,
+                )
+
+    def draw_sprite(
+        self,
+        texture: Texture,
+        x_start: int,
+        x_end: int,
+        x_start_original: float,
+        pixel_width: int,
+        pixel_height: int,
+        y_offset: int,
+        tex_y_offset: int,
+        distance: float,
+        brightness: float,
+    ) -> None:
+        """Draws the visible screen columns x_start...x_end of a sprite, whose placement
+        has been calculated by draw_sprites. Transparent texels are skipped."""
+        for y in range(min(pixel_height, self.pixheight - y_offset)):
+            for x in range(x_start, x_end):
+                tc = texture.sample(
+                    (x - x_start_original) / pixel_width - 1.0,
+                    (y + tex_y_offset) / pixel_height,
+                )
+                if tc[3] > 200:  # consider alpha channel
+                    self.set_pixel(x, y + y_offset, distance, brightness, tc)
 
     def set_pixel(
         self,